@@ -1,10 +1,16 @@
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 import os
+import sys
 import glob
 from typing import Dict, List, Tuple, Optional
-import json
+import orjson
 import matplotlib.pyplot as plt
 import seaborn as sns
 from matplotlib.dates import DateFormatter
@@ -12,6 +18,247 @@ import warnings
 
 warnings.filterwarnings('ignore')
 
+# Only the columns the analysis actually uses; Arrow types them while parsing
+# (status is dictionary-encoded and arrives in pandas as a categorical)
+LOG_COLUMNS = ['timestamp', 'api_call', 'latency_ms', 'status']
+LOG_COLUMN_TYPES = {
+    # timestamp and latency_ms are read as text and coerced per block,
+    # so one bad value only drops its row
+    'timestamp': pa.string(),
+    'api_call': pa.string(),
+    'latency_ms': pa.string(),
+    'status': pa.dictionary(pa.int32(), pa.string())
+}
+TIMESTAMP_TYPE = pa.timestamp('ns')
+# Millisecond latencies fit float32 exactly enough; half the bytes per pass
+LATENCY_TYPE = pa.float32()
+# Columns kept for every row; api_call is only needed for its distinct values
+RECORD_SCHEMA = pa.schema([
+    ('timestamp', TIMESTAMP_TYPE),
+    ('latency_ms', LATENCY_TYPE),
+    ('status', LOG_COLUMN_TYPES['status'])
+])
+# Files are streamed in blocks of this many bytes
+CSV_BLOCK_SIZE = 16 << 20
+
+# Metric names in output order: integer counts, then rounded float metrics
+COUNT_METRIC_KEYS = ('total_requests', 'success_count', 'failure_count')
+FLOAT_METRIC_KEYS = (
+    'success_rate',
+    'failure_rate',
+    'avg_response_time_ms',
+    'min_response_time_ms',
+    'max_response_time_ms',
+    'median_response_time_ms',
+    'p95_response_time_ms',
+    'p99_response_time_ms',
+    'avg_success_response_time_ms',
+    'min_success_response_time_ms',
+    'max_success_response_time_ms',
+    'avg_failure_response_time_ms'
+)
+
+def _coerce_timestamp(values: pa.Array) -> pa.Array:
+    """Cast timestamp text to TIMESTAMP_TYPE; like pd.to_datetime(errors='coerce'), unparseable values become null"""
+    try:
+        return pc.cast(values, TIMESTAMP_TYPE)
+    except pa.ArrowInvalid:
+        # Arrow only parses ISO 8601; other layouts go through pandas
+        coerced = pd.to_datetime(values.to_pandas(), errors='coerce')
+        return pa.array(coerced, type=TIMESTAMP_TYPE, from_pandas=True)
+
+def _coerce_latency(values: pa.Array) -> pa.Array:
+    """Cast latency text to LATENCY_TYPE; like pd.to_numeric(errors='coerce'), unparseable values become null"""
+    try:
+        return pc.cast(values, LATENCY_TYPE)
+    except pa.ArrowInvalid:
+        # Only blocks containing a bad value pay for the pandas fallback
+        coerced = pd.to_numeric(values.to_pandas(), errors='coerce')
+        return pa.array(coerced, type=LATENCY_TYPE, from_pandas=True)
+
+def _read_log_file(file: str, file_id: int, file_id_dtype: type) -> Tuple[pa.Table, pa.ChunkedArray, int]:
+    """
+    Stream one CSV log file through Arrow block by block (releasing the GIL while parsing).
+    
+    Invalid rows are dropped and api_call is reduced to its distinct values as each
+    block arrives, so only the compact RECORD_SCHEMA columns are held for every row. Rows
+    are tagged with an integer source_file_id of file_id_dtype instead of the file path.
+    
+    Returns:
+        (valid records, distinct endpoints, number of rows read)
+    """
+    read_options = pa_csv.ReadOptions(block_size=CSV_BLOCK_SIZE)
+    convert_options = pa_csv.ConvertOptions(
+        include_columns=LOG_COLUMNS,
+        column_types=LOG_COLUMN_TYPES,
+        strings_can_be_null=True
+    )
+    reader = pa_csv.open_csv(file, read_options=read_options, convert_options=convert_options)
+    
+    batches = []
+    endpoints = []
+    rows_read = 0
+    for batch in reader:
+        rows_read += batch.num_rows
+        timestamp = _coerce_timestamp(batch['timestamp'])
+        latency = _coerce_latency(batch['latency_ms'])
+        # Null comparisons are dropped by filter, so missing latencies go too
+        valid = pc.and_(
+            pc.is_valid(timestamp),
+            pc.invert(pc.is_nan(latency))
+        )
+        endpoints.append(pc.unique(batch['api_call'].filter(valid)))
+        batches.append(pa.RecordBatch.from_arrays(
+            [timestamp.filter(valid), latency.filter(valid), batch['status'].filter(valid)],
+            schema=RECORD_SCHEMA
+        ))
+    
+    table = pa.Table.from_batches(batches, schema=RECORD_SCHEMA)
+    table = table.append_column(
+        'source_file_id', pa.array(np.full(table.num_rows, file_id, dtype=file_id_dtype))
+    )
+    return (table,
+            pa.chunked_array(endpoints, type=pa.string()),
+            rows_read)
+
+@lru_cache(maxsize=1)
+def _load_logs(file_stamps: Tuple[Tuple[str, Optional[Tuple[int, int, int]]], ...]) -> Tuple[Optional[pd.DataFrame], int, Tuple[str, ...]]:
+    """
+    Read, combine and clean the given CSV files.
+    
+    Memoized on (path, (mtime, ctime, size)) stamps so re-analyzing unchanged files (e.g. to
+    draw charts after a report) skips parsing entirely. Only the latest file set is
+    kept, so at most one frame stays alive. Callers must treat the returned
+    DataFrame as read-only. Nothing is printed here; the per-file load report is
+    returned so that cache hits can repeat it.
+    
+    Returns:
+        (valid records or None if there are none, number of unique endpoints, load report lines)
+    """
+    csv_files = [file for file, _ in file_stamps]
+    # int16 ids unless there are more files than int16 can number
+    file_id_dtype = np.int16 if len(csv_files) - 1 <= np.iinfo(np.int16).max else np.int32
+    
+    # Read all CSV files in parallel, then combine them in the original order
+    tables = []
+    endpoints = []
+    load_report = []
+    with ThreadPoolExecutor() as executor:
+        futures = [executor.submit(_read_log_file, file, file_id, file_id_dtype)
+                   for file_id, file in enumerate(csv_files)]
+    for file, future in zip(csv_files, futures):
+        try:
+            table, file_endpoints, rows_read = future.result()
+            tables.append(table)
+            endpoints.extend(file_endpoints.chunks)
+            load_report.append(f"Loaded {rows_read} records from {file}")
+        except Exception as e:
+            load_report.append(f"Error reading {file}: {e}")
+            continue
+    
+    if sum(table.num_rows for table in tables) == 0:
+        return None, 0, tuple(load_report)
+    
+    unique_endpoints = pc.count_distinct(
+        pa.chunked_array(endpoints, type=pa.string()), mode='only_valid'
+    ).as_py()
+    
+    # Combine all tables without copying their chunks; invalid rows were already
+    # dropped while streaming and every column is typed by Arrow
+    combined = pa.concat_tables(tables)
+    
+    # split_blocks/self_destruct skip block consolidation and release Arrow
+    # buffers as each column is converted, keeping peak memory near 1x
+    df = combined.to_pandas(split_blocks=True, self_destruct=True)
+    
+    # Clean and prepare data: compare category codes, not strings
+    status_categories = df['status'].cat.categories
+    if 'success' in status_categories:
+        df['success'] = df['status'].cat.codes.to_numpy() == status_categories.get_loc('success')
+    else:
+        df['success'] = np.zeros(len(df), dtype=bool)
+    
+    return df, unique_endpoints, tuple(load_report)
+
+def _format_datetime64(value: np.datetime64) -> str:
+    """Format a datetime64 as 'YYYY-MM-DD HH:MM:SS' without going through Python datetime"""
+    return np.datetime_as_string(value, unit='s').replace('T', ' ')
+
+def _quantiles(values: np.ndarray, qs: Tuple[float, ...]) -> np.ndarray:
+    """Linearly interpolated quantiles (same as pandas' default) from a single np.partition"""
+    positions = np.asarray(qs) * (values.size - 1)
+    lower = np.floor(positions).astype(np.intp)
+    upper = np.minimum(lower + 1, values.size - 1)
+    partitioned = np.partition(values, np.union1d(lower, upper))
+    return partitioned[lower] + (partitioned[upper] - partitioned[lower]) * (positions - lower)
+
+def _latency_stats(latency: np.ndarray, success: np.ndarray) -> Tuple:
+    """
+    Fused latency reductions for one non-empty period.
+    
+    Counts and sums for both outcomes come from two bincount passes keyed on the
+    success flag, so the failure subset is never materialized.
+    
+    Returns:
+        (success_count, failure_count, success_sum, failure_sum, min, max,
+         success_min, success_max, median, p95, p99)
+    """
+    outcome = success.view(np.uint8)
+    failure_count, success_count = np.bincount(outcome, minlength=2)
+    failure_sum, success_sum = np.bincount(outcome, weights=latency, minlength=2)
+    
+    if success_count > 0:
+        success_latency = latency[success]
+        min_success, max_success = success_latency.min(), success_latency.max()
+    else:
+        min_success = max_success = 0.0
+    
+    # One O(n) selection for all three percentiles instead of a full sort
+    median, p95, p99 = _quantiles(latency, (0.5, 0.95, 0.99))
+    
+    return (int(success_count), int(failure_count), success_sum, failure_sum,
+            latency.min(), latency.max(), min_success, max_success,
+            median, p95, p99)
+
+def _file_stamps(csv_files: List[str]) -> Tuple[Tuple[str, Optional[Tuple[int, int, int]]], ...]:
+    """
+    Cache key for _load_logs: each file with its modification time, change time and size.
+    
+    ctime moves on every write and cannot be set back like mtime, so a rewrite is
+    re-read even when it keeps the old mtime and size.
+    """
+    stamps = []
+    for file in csv_files:
+        try:
+            stat = os.stat(file)
+            stamps.append((file, (stat.st_mtime_ns, stat.st_ctime_ns, stat.st_size)))
+        except OSError:
+            # Vanished since the glob; _load_logs reports it when the read fails
+            stamps.append((file, None))
+    return tuple(stamps)
+
+def load_api_logs(csv_files_pattern: str = "*.csv") -> Optional[pd.DataFrame]:
+    """
+    Load the cleaned log records that analyze_api_logs works on.
+    
+    Parsed files are cached by modification time, change time and size, so calling this
+    after an analysis of the same unchanged files (e.g. to draw charts) does not re-read
+    them. Unlike analyze_api_logs, it does not print the per-file load report.
+    
+    Args:
+        csv_files_pattern: Pattern to match CSV files (e.g., "logs/*.csv", "api_logs_*.csv")
+    
+    Returns:
+        DataFrame of valid records, or None if no data could be loaded
+    """
+    csv_files = sorted(glob.glob(csv_files_pattern))
+    if not csv_files:
+        return None
+    
+    df, _, _ = _load_logs(_file_stamps(csv_files))
+    # Hand out a deep copy so callers' changes never reach the cached frame
+    return None if df is None else df.copy(deep=True)
+
 def analyze_api_logs(csv_files_pattern: str = "*.csv", output_format: str = "json", generate_charts: bool = False) -> Dict:
     """
     Analyze API logs from CSV files and provide comprehensive metrics.
@@ -32,135 +279,105 @@ def analyze_api_logs(csv_files_pattern: str = "*.csv", output_format: str = "jso
         print(f"No CSV files found matching pattern: {csv_files_pattern}")
         return {}
     
-    # Read and combine all CSV files
-    all_data = []
-    for file in csv_files:
-        try:
-            df = pd.read_csv(file)
-            df['source_file'] = file
-            all_data.append(df)
-            print(f"Loaded {len(df)} records from {file}")
-        except Exception as e:
-            print(f"Error reading {file}: {e}")
-            continue
-    
-    if not all_data:
+    csv_files = sorted(csv_files)
+    df, unique_endpoints, load_report = _load_logs(_file_stamps(csv_files))
+    # Printed here rather than while loading, so a cached load reports the same
+    for line in load_report:
+        print(line)
+    if df is None:
         print("No valid data found in CSV files")
         return {}
     
-    # Combine all dataframes
-    df = pd.concat(all_data, ignore_index=True)
-    
-    # Clean and prepare data
-    df['timestamp'] = pd.to_datetime(df['timestamp'])
-    df['success'] = df['status'] == 'success'
-    df['latency_ms'] = pd.to_numeric(df['latency_ms'], errors='coerce')
-    
-    # Remove rows with invalid data
-    df = df.dropna(subset=['timestamp', 'latency_ms'])
-    
     print(f"Total records processed: {len(df)}")
     
-    # Define time periods
-    now = datetime.now()
-    today = now.replace(hour=0, minute=0, second=0, microsecond=0)
-    week_start = today - timedelta(days=today.weekday())
-    month_start = today.replace(day=1)
-    
-    time_periods = {
-        'today': df[df['timestamp'] >= today],
-        'this_week': df[df['timestamp'] >= week_start],
-        'this_month': df[df['timestamp'] >= month_start],
-        'last_7_days': df[df['timestamp'] >= (now - timedelta(days=7))],
-        'last_30_days': df[df['timestamp'] >= (now - timedelta(days=30))],
-        'all_time': df
+    # Define time periods in datetime64 (local wall-clock time, like the logs)
+    now = np.datetime64(datetime.now(), 'ns')
+    today = now.astype('datetime64[D]')
+    # Day 0 of the epoch (1970-01-01) was a Thursday, i.e. weekday 3
+    week_start = today - np.timedelta64((today.astype(np.int64) + 3) % 7, 'D')
+    month_start = now.astype('datetime64[M]')
+    
+    period_starts = {
+        'today': today,
+        'this_week': week_start,
+        'this_month': month_start,
+        'last_7_days': now - np.timedelta64(7, 'D'),
+        'last_30_days': now - np.timedelta64(30, 'D'),
+        'all_time': None
     }
     
-    def calculate_metrics(data: pd.DataFrame) -> Dict:
-        """Calculate metrics for a given dataset"""
-        if len(data) == 0:
-            return {
-                'total_requests': 0,
-                'success_count': 0,
-                'failure_count': 0,
-                'success_rate': 0.0,
-                'failure_rate': 0.0,
-                'avg_response_time_ms': 0.0,
-                'min_response_time_ms': 0.0,
-                'max_response_time_ms': 0.0,
-                'median_response_time_ms': 0.0,
-                'p95_response_time_ms': 0.0,
-                'p99_response_time_ms': 0.0,
-                'avg_success_response_time_ms': 0.0,
-                'min_success_response_time_ms': 0.0,
-                'max_success_response_time_ms': 0.0,
-                'avg_failure_response_time_ms': 0.0
-            }
-        
-        success_data = data[data['success']]
-        failure_data = data[~data['success']]
-        
-        metrics = {
-            'total_requests': len(data),
-            'success_count': len(success_data),
-            'failure_count': len(failure_data),
-            'success_rate': len(success_data) / len(data) * 100,
-            'failure_rate': len(failure_data) / len(data) * 100,
-            'avg_response_time_ms': data['latency_ms'].mean(),
-            'min_response_time_ms': data['latency_ms'].min(),
-            'max_response_time_ms': data['latency_ms'].max(),
-            'median_response_time_ms': data['latency_ms'].median(),
-            'p95_response_time_ms': data['latency_ms'].quantile(0.95),
-            'p99_response_time_ms': data['latency_ms'].quantile(0.99)
-        }
-        
-        # Success-specific metrics
-        if len(success_data) > 0:
-            metrics.update({
-                'avg_success_response_time_ms': success_data['latency_ms'].mean(),
-                'min_success_response_time_ms': success_data['latency_ms'].min(),
-                'max_success_response_time_ms': success_data['latency_ms'].max()
-            })
+    # One bit per period: every row's period membership in a single array,
+    # built from plain int64 nanosecond compares rather than Timestamp ones
+    timestamps_ns = df['timestamp'].to_numpy().astype('datetime64[ns]', copy=False).view(np.int64)
+    period_mask = np.zeros(len(df), dtype=np.uint8)
+    for bit, start in enumerate(period_starts.values()):
+        if start is None:
+            continue  # all_time covers every row and needs no bit
+        start_ns = start.astype('datetime64[ns]').view(np.int64)
+        period_mask |= (timestamps_ns >= start_ns).view(np.uint8) << bit
+    
+    # Row indices per period into the single combined frame; all_time takes
+    # every row, so a slice keeps its arrays as views instead of copies
+    period_rows = {}
+    for bit, (period_name, start) in enumerate(period_starts.items()):
+        if start is None:
+            period_rows[period_name] = slice(None)
         else:
-            metrics.update({
-                'avg_success_response_time_ms': 0.0,
-                'min_success_response_time_ms': 0.0,
-                'max_success_response_time_ms': 0.0
-            })
+            period_rows[period_name] = np.flatnonzero(period_mask & np.uint8(1 << bit))
+    
+    latency = df['latency_ms'].to_numpy()
+    success = df['success'].to_numpy()
+    
+    def calculate_metrics(latency: np.ndarray, success: np.ndarray) -> Dict:
+        """Calculate metrics for one period's latencies and success flags"""
+        if latency.size == 0:
+            return {**dict.fromkeys(COUNT_METRIC_KEYS, 0), **dict.fromkeys(FLOAT_METRIC_KEYS, 0.0)}
         
-        # Failure-specific metrics
-        if len(failure_data) > 0:
-            metrics['avg_failure_response_time_ms'] = failure_data['latency_ms'].mean()
-        else:
-            metrics['avg_failure_response_time_ms'] = 0.0
+        (success_count, failure_count, success_sum, failure_sum,
+         min_latency, max_latency, min_success, max_success,
+         median, p95, p99) = _latency_stats(latency, success)
+        total = latency.size
         
-        # Round numeric values for cleaner output
-        for key, value in metrics.items():
-            if isinstance(value, (int, float)) and not isinstance(value, bool):
-                metrics[key] = round(value, 2)
+        # Filled positionally in FLOAT_METRIC_KEYS order
+        values = np.array([
+            success_count / total * 100,
+            failure_count / total * 100,
+            (success_sum + failure_sum) / total,
+            min_latency,
+            max_latency,
+            median,
+            p95,
+            p99,
+            success_sum / success_count if success_count else 0.0,
+            min_success,
+            max_success,
+            failure_sum / failure_count if failure_count else 0.0
+        ])
+        
+        metrics = dict(zip(COUNT_METRIC_KEYS, (total, success_count, failure_count)))
+        # Round every float metric in one vectorized call for cleaner output
+        metrics.update(zip(FLOAT_METRIC_KEYS, np.round(values, 2).tolist()))
         
         return metrics
     
     # Calculate metrics for each time period
     results = {}
-    for period_name, period_data in time_periods.items():
-        results[period_name] = calculate_metrics(period_data)
+    for period_name, rows in period_rows.items():
+        results[period_name] = calculate_metrics(latency[rows], success[rows])
     
     # Add summary information
     results['summary'] = {
-        'analysis_date': now.strftime('%Y-%m-%d %H:%M:%S'),
+        'analysis_date': _format_datetime64(now),
+        # Indexed by each record's source_file_id
         'files_analyzed': csv_files,
         'date_range': {
-            'earliest': df['timestamp'].min().strftime('%Y-%m-%d %H:%M:%S'),
-            'latest': df['timestamp'].max().strftime('%Y-%m-%d %H:%M:%S')
+            'earliest': _format_datetime64(timestamps_ns.min().view('datetime64[ns]')),
+            'latest': _format_datetime64(timestamps_ns.max().view('datetime64[ns]'))
         },
-        'unique_endpoints': df['api_call'].nunique(),
+        'unique_endpoints': unique_endpoints,
         'total_records_processed': len(df)
     }
     
-    # Store dataframe for visualization
-    results['_dataframe'] = df
-    
     # Format output based on requested format
     if output_format == "pretty":
         print_pretty_results(results)
@@ -168,9 +385,7 @@ def analyze_api_logs(csv_files_pattern: str = "*.csv", output_format: str = "jso
             generate_visualizations(df, results)
         return results
     elif output_format == "json":
-        # Remove dataframe before JSON output
-        results_copy = {k: v for k, v in results.items() if k != '_dataframe'}
-        print(json.dumps(results_copy, indent=2, default=str))
+        print_json_results(results)
         if generate_charts:
             generate_visualizations(df, results)
         return results
@@ -241,6 +456,24 @@ def print_pretty_results(results: Dict):
                 print(f"\n   FAILURE RESPONSE TIMES (ms)")
                 print(f"   Average: {metrics['avg_failure_response_time_ms']:,.0f}")
 
+def print_json_results(results: Dict):
+    """Write results to stdout as indented JSON, straight from orjson's bytes when possible"""
+    payload = orjson.dumps(
+        results,
+        default=str,
+        option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_APPEND_NEWLINE
+    )
+    
+    stdout_buffer = getattr(sys.stdout, 'buffer', None)
+    if stdout_buffer is None:
+        # Text-only streams (e.g. notebooks) have no underlying byte buffer
+        sys.stdout.write(payload.decode())
+        return
+    # Flush pending print() output first so the JSON lands after it
+    sys.stdout.flush()
+    stdout_buffer.write(payload)
+    stdout_buffer.flush()
+
 def generate_visualizations(df: pd.DataFrame, results: Dict):
     """Generate visualization charts for the API log analysis"""
     
@@ -252,15 +485,25 @@ def generate_visualizations(df: pd.DataFrame, results: Dict):
     fig, axes = plt.subplots(2, 2, figsize=(16, 12))
     fig.suptitle('API Log Analysis Dashboard', fontsize=16, fontweight='bold')
     
+    # Hourly buckets as int64 offsets from the first hour; bincount gives each
+    # per-hour total in a single pass, then hours without requests are dropped
+    # so the charts only show hours where data exists
+    timestamps_ns = df['timestamp'].to_numpy().astype('datetime64[ns]', copy=False).view(np.int64)
+    hour_ids = timestamps_ns // 3_600_000_000_000
+    first_hour = hour_ids.min()
+    hour_offsets = hour_ids - first_hour
+    hourly_total = np.bincount(hour_offsets)
+    active_hours = np.flatnonzero(hourly_total)
+    hours = (first_hour + active_hours).astype('datetime64[h]')
+    hourly_total = hourly_total[active_hours]
+    hourly_success = np.bincount(hour_offsets, weights=df['success'].to_numpy(np.float64))[active_hours]
+    hourly_latency = np.bincount(hour_offsets, weights=df['latency_ms'].to_numpy(np.float64))[active_hours]
+    
     # 1. Success Rate Over Time
     ax1 = axes[0, 0]
-    df_hourly = df.set_index('timestamp').resample('H').agg({
-        'success': ['count', 'sum']
-    }).fillna(0)
-    df_hourly.columns = ['total_requests', 'successful_requests']
-    df_hourly['success_rate'] = (df_hourly['successful_requests'] / df_hourly['total_requests'] * 100).fillna(0)
+    hourly_success_rate = hourly_success / hourly_total * 100
     
-    ax1.plot(df_hourly.index, df_hourly['success_rate'], marker='o', linewidth=2, markersize=4)
+    ax1.plot(hours, hourly_success_rate, marker='o', linewidth=2, markersize=4)
     ax1.set_title('Success Rate Over Time', fontweight='bold')
     ax1.set_ylabel('Success Rate (%)')
     ax1.set_ylim(0, 105)
@@ -270,10 +513,12 @@ def generate_visualizations(df: pd.DataFrame, results: Dict):
     
     # 2. Response Time Distribution
     ax2 = axes[0, 1]
-    success_data = df[df['success']]['latency_ms']
-    failure_data = df[~df['success']]['latency_ms']
+    latency = df['latency_ms'].to_numpy()
+    success_mask = df['success'].to_numpy()
+    success_data = latency[success_mask]
+    failure_data = latency[~success_mask]
     
-    bins = np.linspace(0, min(df['latency_ms'].quantile(0.95), 50000), 30)
+    bins = np.linspace(0, min(_quantiles(latency, (0.95,))[0], 50000), 30)
     ax2.hist(success_data, bins=bins, alpha=0.7, label='Success', color='green')
     ax2.hist(failure_data, bins=bins, alpha=0.7, label='Failure', color='red')
     ax2.set_title('Response Time Distribution', fontweight='bold')
@@ -284,8 +529,8 @@ def generate_visualizations(df: pd.DataFrame, results: Dict):
     
     # 3. Response Time Over Time
     ax3 = axes[1, 0]
-    df_resampled = df.set_index('timestamp').resample('H')['latency_ms'].mean().fillna(0)
-    ax3.plot(df_resampled.index, df_resampled.values, marker='s', linewidth=2, markersize=4, color='orange')
+    hourly_mean_latency = hourly_latency / hourly_total
+    ax3.plot(hours, hourly_mean_latency, marker='s', linewidth=2, markersize=4, color='orange')
     ax3.set_title('Average Response Time Over Time', fontweight='bold')
     ax3.set_ylabel('Response Time (ms)')
     ax3.grid(True, alpha=0.3)
@@ -296,14 +541,14 @@ def generate_visualizations(df: pd.DataFrame, results: Dict):
     ax4 = axes[1, 1]
     periods = ['today', 'last_7_days', 'last_30_days', 'all_time']
     period_labels = ['Today', 'Last 7 Days', 'Last 30 Days', 'All Time']
-    success_counts = [results[p]['success_count'] for p in periods]
-    failure_counts = [results[p]['failure_count'] for p in periods]
+    # One row per period: (success_count, failure_count)
+    counts = np.array([[results[p]['success_count'], results[p]['failure_count']] for p in periods])
     
     x = np.arange(len(period_labels))
     width = 0.35
     
-    bars1 = ax4.bar(x - width/2, success_counts, width, label='Success', color='green', alpha=0.7)
-    bars2 = ax4.bar(x + width/2, failure_counts, width, label='Failure', color='red', alpha=0.7)
+    bars1 = ax4.bar(x - width/2, counts[:, 0], width, label='Success', color='green', alpha=0.7)
+    bars2 = ax4.bar(x + width/2, counts[:, 1], width, label='Failure', color='red', alpha=0.7)
     
     ax4.set_title('Request Counts by Time Period', fontweight='bold')
     ax4.set_xlabel('Time Period')
@@ -313,16 +558,10 @@ def generate_visualizations(df: pd.DataFrame, results: Dict):
     ax4.legend()
     ax4.grid(True, alpha=0.3)
     
-    # Add value labels on bars
-    for bars in [bars1, bars2]:
-        for bar in bars:
-            height = bar.get_height()
-            if height > 0:
-                ax4.annotate(f'{int(height)}',
-                           xy=(bar.get_x() + bar.get_width() / 2, height),
-                           xytext=(0, 3),
-                           textcoords="offset points",
-                           ha='center', va='bottom', fontsize=9)
+    # Add value labels on bars (empty bars stay unlabelled)
+    for bars, bar_counts in [(bars1, counts[:, 0]), (bars2, counts[:, 1])]:
+        ax4.bar_label(bars, labels=np.where(bar_counts > 0, bar_counts.astype(str), ''),
+                      padding=3, fontsize=9)
     
     plt.tight_layout()
     
@@ -346,10 +585,10 @@ if __name__ == "__main__":
     results = analyze_api_logs("*.csv", "pretty")
     
     # Ask if user wants charts after showing results
-    if prompt_for_charts():
+    if results and prompt_for_charts():
         print("\nGenerating charts...")
-        # Re-run analysis with chart generation
-        results = analyze_api_logs("*.csv", "pretty", generate_charts=True)
+        # Chart the already-computed results; the parsed logs come from the cache
+        generate_visualizations(load_api_logs("*.csv"), results)
     
     # Example 2: Direct chart generation
     # results = analyze_api_logs("api_logs_*.csv", "pretty", generate_charts=True)